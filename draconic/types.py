@@ -1,6 +1,8 @@
 import collections.abc
+import copy
+import itertools
 import operator as op
-from collections import UserList, UserString
+from collections import UserString
 
 from .exceptions import *
 from .string import JoinProxy, PRINTF_TEMPLATE_RE, TranslateTableProxy
@@ -9,356 +11,521 @@ from .versions import PY_39
 __all__ = ("safe_list", "safe_dict", "safe_set", "safe_str", "approx_len_of")
 
 _sentinel = object()
+# exact types that never contribute to approx_len_of and have no children to walk
+_SCALAR_TYPES = frozenset((int, float, complex, bool, type(None)))
+# exact builtin types that can never carry a cached __approx_len__
+_UNCACHEABLE_TYPES = frozenset((list, tuple, dict, set, frozenset, str, bytes, range, type({}.items())))
 
 
 # ---- size helper ----
-def approx_len_of(obj, visited=None):
+def approx_len_of(obj):
     """Gets the approximate size of an object (including recursive objects)."""
+    if type(obj) in _SCALAR_TYPES:
+        return 0
+
     if isinstance(obj, (str, bytes, UserString)):
         return len(obj)
 
-    if hasattr(obj, "__approx_len__"):
-        return obj.__approx_len__
-
-    if visited is None:
-        visited = [obj]
+    uncacheable = type(obj) in _UNCACHEABLE_TYPES
+    if not uncacheable:
+        cached = getattr(obj, "__approx_len__", None)
+        if cached is not None:
+            return cached
+
+    # walk the object with an explicit stack; visited objects are tracked by identity so that we never recurse
+    # too deeply or call user-defined __eq__/__hash__
+    # the visited map holds a reference to each object so that ids of temporaries are not reused
+    size = 0
+    stack = [obj]
+    visited = {id(obj): obj}
+    while stack:
+        current = stack.pop()
+        if current is not obj and type(current) not in _UNCACHEABLE_TYPES:
+            cached = getattr(current, "__approx_len__", None)
+            if cached is not None:
+                size += cached
+                continue
 
-    size = op.length_hint(obj)
+        size += op.length_hint(current)
 
-    if isinstance(obj, dict):
-        obj = obj.items()
+        if isinstance(current, dict):
+            # count each entry as a (key, value) pair of size 2, but walk the keys and values directly so we don't
+            # build a tuple for every entry
+            size += 2 * len(current)
+            obj_iter = itertools.chain(dict.keys(current), dict.values(current))
+        else:
+            try:
+                obj_iter = iter(current)
+            except TypeError:  # object is not iterable
+                continue
 
-    try:
-        obj_iter = iter(obj)
-    except TypeError:  # object is not iterable
-        pass
-    else:
         for child in obj_iter:
-            if child in visited:
+            if type(child) in _SCALAR_TYPES:
+                continue
+            # strings are leaves, so they never need cycle tracking
+            if isinstance(child, (str, bytes, UserString)):
+                size += len(child)
+                continue
+            if id(child) in visited:
                 continue
-            size += approx_len_of(child, visited)
-            visited.append(child)
+            visited[id(child)] = child
+            stack.append(child)
 
-    try:
-        setattr(obj, "__approx_len__", size)
-    except (AttributeError, TypeError):
-        pass
+    if not uncacheable:
+        try:
+            setattr(obj, "__approx_len__", size)
+        except (AttributeError, TypeError):
+            pass
 
     return size
 
 
-# ---- types ----
-# each function is a function that returns a class based on Draconic config
-# ... look, it works
-def safe_list(config):
-    class SafeList(UserList):  # extends UserList so that [x] * y returns a SafeList, not a list
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, **kwargs)
-            self.__approx_len__ = approx_len_of(self)
-
-        def append(self, obj):
-            if approx_len_of(self) + 1 > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This list is too long")
-            super().append(obj)
-            self.__approx_len__ += 1
-
-        def extend(self, iterable):
-            other_len = approx_len_of(iterable)
-            if approx_len_of(self) + other_len > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This list is too long")
-            super().extend(iterable)
-            self.__approx_len__ += other_len
-
-        def pop(self, i=-1):
-            retval = super().pop(i)
-            self.__approx_len__ -= 1
-            return retval
-
-        def remove(self, item):
-            super().remove(item)
-            self.__approx_len__ -= 1
-
-        def clear(self):
-            super().clear()
-            self.__approx_len__ = 0
-
-        def __mul__(self, n):
-            # to prevent the recalculation of the length on list mult we manually set a new instance's
-            # data and approx len (JIRA-54)
-            new = SafeList()
-            new.data = self.data * n
-            new.__approx_len__ = self.__approx_len__ * n
-            return new
-
-    return SafeList
-
-
-def safe_set(config):
-    class SafeSet(set):
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, **kwargs)
-            self.__approx_len__ = approx_len_of(self)
-
-        def union(self, *s):
-            if approx_len_of(self) + sum(approx_len_of(other) for other in s) > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This set is too large")
-            return SafeSet(super().union(*s))
-
-        def __or__(self, other):
-            return self.union(other)
-
-        def intersection(self, *s):
-            if any(approx_len_of(other) > config.max_const_len for other in s):
-                _raise_in_context(IterableTooLong, "This set is too large")
-            return SafeSet(super().intersection(*s))
-
-        def __and__(self, other):
-            return self.intersection(other)
+_get_approx_len = op.attrgetter("__approx_len__")
 
-        def symmetric_difference(self, *s):
-            if approx_len_of(self) + sum(approx_len_of(other) for other in s) > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This set is too large")
-            return SafeSet(super().symmetric_difference(*s))
 
-        def __xor__(self, other):
-            return self.symmetric_difference(other)
-
-        # difference not reimplemented as it cannot grow the set and has no cheap approximation for len
-
-        def update(self, *s):
-            other_lens = sum(approx_len_of(other) for other in s)
-            if approx_len_of(self) + other_lens > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This set is too large")
-            super().update(*s)
-            self.__approx_len__ += other_lens
-
-        def intersection_update(self, *s):
-            if any(approx_len_of(other) > config.max_const_len for other in s):
-                _raise_in_context(IterableTooLong, "This set is too large")
-            super().intersection_update(*s)
-            self.__approx_len__ = min(self.__approx_len__, *(approx_len_of(other) for other in s))
-
-        def symmetric_difference_update(self, s):
-            total_approx = approx_len_of(self) + approx_len_of(s)
-            if total_approx > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This set is too large")
-            super().symmetric_difference_update(s)
-            self.__approx_len__ = total_approx
-
-        # difference_update not reimplemented as it cannot grow the set and has no cheap approximation for len
-
-        def add(self, element):
-            if approx_len_of(self) + 1 > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This set is too large")
-            super().add(element)
-            self.__approx_len__ += 1
-
-        def pop(self):
-            retval = super().pop()
-            self.__approx_len__ -= 1
-            return retval
-
-        def remove(self, element):
-            super().remove(element)
-            self.__approx_len__ -= 1
-
-        # discard not reimplemented as the discarded element may not be a member
-
-        def clear(self):
-            super().clear()
-            self.__approx_len__ = 0
-
-    return SafeSet
-
-
-def safe_dict(config):
-    class SafeDict(dict):
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, **kwargs)
-            self.__approx_len__ = approx_len_of(self)
-
-        def update(self, other_dict=None, **kvs):
-            if other_dict is None:
-                other_dict = {}
+def _approx_len_sum(objs):
+    """Gets the total approximate size of a sequence of objects, using their cached sizes if they all have one."""
+    try:
+        return sum(map(_get_approx_len, objs))
+    except AttributeError:
+        return sum(approx_len_of(obj) for obj in objs)
 
-            other_lens = approx_len_of(other_dict) + approx_len_of(kvs)
-            if approx_len_of(self) + other_lens > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This dict is too large")
 
-            super().update(other_dict, **kvs)
-            self.__approx_len__ += other_lens
+# ---- types ----
+# each safe type is defined once here; the safe_* factories below return a subclass bound to a Draconic config
+class _SafeList(list):  # overrides the operators below so that [x] + y and [x] * y return a SafeList, not a list
+    __slots__ = ("__approx_len__", "__weakref__")
+    _config = None  # set by safe_list()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__approx_len__ = approx_len_of(self)
+
+    def append(self, obj):
+        if self.__approx_len__ + 1 > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This list is too long")
+        list.append(self, obj)
+        self.__approx_len__ += 1
+
+    def extend(self, iterable):
+        if not hasattr(iterable, "__len__"):  # consume the entire iterator so we can do length checking
+            iterable = list(iterable)
+
+        other_len = approx_len_of(iterable)
+        if self.__approx_len__ + other_len > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This list is too long")
+        super().extend(iterable)
+        self.__approx_len__ += other_len
+
+    def pop(self, i=-1):
+        retval = super().pop(i)
+        self.__approx_len__ -= 1
+        return retval
+
+    def remove(self, item):
+        super().remove(item)
+        self.__approx_len__ -= 1
+
+    def clear(self):
+        super().clear()
+        self.__approx_len__ = 0
+
+    def __copy__(self):
+        # by default the copy would append every item again, counting each one twice
+        new = self.__class__()
+        list.extend(new, self)
+        new.__approx_len__ = self.__approx_len__
+        return new
+
+    def __deepcopy__(self, memo):
+        new = self.__class__()
+        memo[id(self)] = new
+        list.extend(new, [copy.deepcopy(item, memo) for item in self])
+        new.__approx_len__ = self.__approx_len__
+        return new
+
+    def _concat(self, left, right):
+        new_len = approx_len_of(left) + approx_len_of(right)
+        if new_len > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This list is too long")
+        new = self.__class__()
+        list.extend(new, left)
+        list.extend(new, right)
+        new.__approx_len__ = new_len
+        return new
+
+    def __add__(self, other):
+        if not isinstance(other, list):
+            other = list(other)
+        return self._concat(self, other)
+
+    def __radd__(self, other):
+        if not isinstance(other, list):
+            other = list(other)
+        return self._concat(other, self)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __mul__(self, n):
+        n = op.index(n)
+        # check the length before multiplying so that we never allocate a list that is too long
+        if self.__approx_len__ * n > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This list is too long")
+        # to prevent the recalculation of the length on list mult we copy the items into a new instance with
+        # list.extend and list.__imul__, which don't count them again, and carry over the approx len (JIRA-54)
+        new = self.__class__()
+        list.extend(new, self)
+        list.__imul__(new, n)
+        new.__approx_len__ = self.__approx_len__ * max(n, 0)
+        return new
+
+    __rmul__ = __mul__
+
+    def __imul__(self, n):
+        n = op.index(n)
+        if self.__approx_len__ * n > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This list is too long")
+        list.__imul__(self, n)
+        self.__approx_len__ *= max(n, 0)
+        return self
+
+
+class _SafeSet(set):
+    __slots__ = ("__approx_len__",)
+    _config = None  # set by safe_set()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__approx_len__ = approx_len_of(self)
+
+    def union(self, *s):
+        if self.__approx_len__ + _approx_len_sum(s) > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This set is too large")
+        return self.__class__(super().union(*s))
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def intersection(self, *s):
+        max_len = self._config.max_const_len
+        if any(approx_len_of(other) > max_len for other in s):
+            _raise_in_context(IterableTooLong, "This set is too large")
+        return self.__class__(super().intersection(*s))
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def symmetric_difference(self, *s):
+        if self.__approx_len__ + _approx_len_sum(s) > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This set is too large")
+        return self.__class__(super().symmetric_difference(*s))
+
+    def __xor__(self, other):
+        return self.symmetric_difference(other)
+
+    # difference not reimplemented as it cannot grow the set and has no cheap approximation for len
+
+    def update(self, *s):
+        other_lens = _approx_len_sum(s)
+        if self.__approx_len__ + other_lens > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This set is too large")
+        super().update(*s)
+        self.__approx_len__ += other_lens
+
+    def intersection_update(self, *s):
+        max_len = self._config.max_const_len
+        if any(approx_len_of(other) > max_len for other in s):
+            _raise_in_context(IterableTooLong, "This set is too large")
+        super().intersection_update(*s)
+        self.__approx_len__ = min(self.__approx_len__, *(approx_len_of(other) for other in s))
+
+    def symmetric_difference_update(self, s):
+        total_approx = self.__approx_len__ + approx_len_of(s)
+        if total_approx > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This set is too large")
+        super().symmetric_difference_update(s)
+        self.__approx_len__ = total_approx
+
+    # difference_update not reimplemented as it cannot grow the set and has no cheap approximation for len
+
+    def add(self, element):
+        if self.__approx_len__ + 1 > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This set is too large")
+        set.add(self, element)
+        self.__approx_len__ += 1
+
+    def pop(self):
+        retval = super().pop()
+        self.__approx_len__ -= 1
+        return retval
+
+    def remove(self, element):
+        super().remove(element)
+        self.__approx_len__ -= 1
+
+    # discard not reimplemented as the discarded element may not be a member
+
+    def clear(self):
+        super().clear()
+        self.__approx_len__ = 0
+
+
+class _SafeDict(dict):
+    __slots__ = ("__approx_len__", "_sizes", "__weakref__")
+    _config = None  # set by safe_dict()
+
+    def __init__(self, *args, **kwargs):
+        # the approximate size counted for each value set by __setitem__, so that removing the key frees the same
+        # amount; entries without a recorded size were counted as 1
+        self._sizes = {}
+        super().__init__(*args, **kwargs)
+        self.__approx_len__ = approx_len_of(self)
+
+    def update(self, other_dict=None, **kvs):
+        if other_dict is None:
+            other_dict = {}
+        elif not hasattr(other_dict, "keys"):
+            # collect the pairs into a dict so we can do length checking and know which keys get overwritten
+            other_dict = dict(other_dict)
+
+        other_lens = approx_len_of(other_dict) + approx_len_of(kvs)
+        if self.__approx_len__ + other_lens > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This dict is too large")
+
+        super().update(other_dict, **kvs)
+        self.__approx_len__ += other_lens
+
+        if self._sizes:
+            # the entries we just wrote have no recorded size, so forget any sizes recorded for the values they replaced
+            for key in itertools.chain(other_dict.keys(), kvs):
+                self._sizes.pop(key, None)
+
+    def __setitem__(self, key, value):
+        other_len = approx_len_of(value)
+        # overwriting a key frees the size counted for its old value
+        old_len = self._sizes.get(key, 1) if key in self else 0
+        if self.__approx_len__ - old_len + other_len > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This dict is too large")
+        self.__approx_len__ += other_len - old_len
+        self._sizes[key] = other_len
+        return dict.__setitem__(self, key, value)
+
+    def pop(self, k, default=_sentinel):
+        if default is not _sentinel and k not in self:
+            return default
+        retval = super().pop(k)
+        self.__approx_len__ -= self._sizes.pop(k, 1)
+        return retval
+
+    def popitem(self):
+        retval = super().popitem()
+        self.__approx_len__ -= self._sizes.pop(retval[0], 1)
+        return retval
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.__approx_len__ -= self._sizes.pop(key, 1)
+
+    def clear(self):
+        super().clear()
+        self._sizes.clear()
+        self.__approx_len__ = 0
+
+    def __copy__(self):
+        # by default the copy would share our _sizes and set every item again, so build it directly
+        new = self.__class__()
+        dict.update(new, self)
+        new.__approx_len__ = self.__approx_len__
+        new._sizes = self._sizes.copy()
+        return new
+
+    def __deepcopy__(self, memo):
+        new = self.__class__()
+        memo[id(self)] = new
+        for key, value in self.items():
+            dict.__setitem__(new, copy.deepcopy(key, memo), copy.deepcopy(value, memo))
+        new.__approx_len__ = self.__approx_len__
+        new._sizes = {copy.deepcopy(key, memo): size for key, size in self._sizes.items()}
+        return new
+
+    def __getattr__(self, attr):
+        try:
+            return self[attr]
+        except KeyError:
+            raise AttributeError
+
+    if PY_39:
 
-        def __setitem__(self, key, value):
-            other_len = approx_len_of(value)
-            if approx_len_of(self) + other_len > config.max_const_len:
+        def __or__(self, other):
+            if self.__approx_len__ + approx_len_of(other) > self._config.max_const_len:
                 _raise_in_context(IterableTooLong, "This dict is too large")
-            self.__approx_len__ += other_len
-            return super().__setitem__(key, value)
-
-        def pop(self, k, default=_sentinel):
-            if default is not _sentinel:
-                retval = super().pop(k, default)
-            else:
-                retval = super().pop(k)
-                self.__approx_len__ -= 1
-            return retval
-
-        def __delitem__(self, key):
-            super().__delitem__(key)
-            self.__approx_len__ -= 1
-
-        def __getattr__(self, attr):
-            try:
-                return self[attr]
-            except KeyError:
-                raise AttributeError
-
-        if PY_39:
-
-            def __or__(self, other):
-                if approx_len_of(self) + approx_len_of(other) > config.max_const_len:
-                    _raise_in_context(IterableTooLong, "This dict is too large")
-
-                return SafeDict(super().__or__(other))
 
-    return SafeDict
+            return self.__class__(super().__or__(other))
 
 
 _real_str = str
 
 
-def safe_str(config):
-    # noinspection PyShadowingBuiltins, PyPep8Naming
-    # naming it SafeStr would break typeof backward compatibility :(
-    class str(UserString, _real_str):
-        def __init__(self, seq):
-            if isinstance(seq, UserString):
-                self.data = seq.data[:]
-            elif isinstance(seq, _real_str):
-                self.data = seq
-            else:
-                self.data = _real_str(seq)
+class _SafeStr(UserString, _real_str):
+    _config = None  # set by safe_str()
 
-        def center(self, width, *args):
-            if width > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This str is too large")
-            return super().center(width, *args)
+    def __init__(self, seq):
+        if isinstance(seq, UserString):
+            self.data = seq.data[:]
+        elif isinstance(seq, _real_str):
+            self.data = seq
+        else:
+            self.data = _real_str(seq)
 
-        def encode(self, *_, **__):
-            _raise_in_context(FeatureNotAvailable, "This method is not allowed")
+    def center(self, width, *args):
+        if width > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This str is too large")
+        return super().center(width, *args)
 
-        def expandtabs(self, tabsize=8):
-            if self.count("\t") * tabsize > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This str is too large")
-            return super().expandtabs(tabsize)
-
-        def format(self, *args, **kwargs):
-            _raise_in_context(FeatureNotAvailable, "This method is not allowed")
-
-        def format_map(self, mapping):
-            _raise_in_context(FeatureNotAvailable, "This method is not allowed")
-
-        def join(self, seq):
-            full_seq = list(seq)  # consume the entire iterator so we can do length checking
-            i = JoinProxy(self.__class__, full_seq)  # proxy it so that .join gets the right types
-            if len(full_seq) * len(self) + approx_len_of(full_seq) > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This str is too large")
-            return super().join(i)
+    def encode(self, *_, **__):
+        _raise_in_context(FeatureNotAvailable, "This method is not allowed")
 
-        def ljust(self, width, *args):
-            if width > config.max_const_len:
+    def expandtabs(self, tabsize=8):
+        max_len = self._config.max_const_len
+        # only count the tabs if even a str of all tabs could be too large
+        if len(self) * tabsize > max_len:
+            if self.count("\t") * tabsize > max_len:
                 _raise_in_context(IterableTooLong, "This str is too large")
-            return super().ljust(width, *args)
-
-        @staticmethod
-        def maketrans(*args):
-            if len(args) == 1 and isinstance(args[0], dict):
-                # str.maketrans expects a dict object and nothing else
-                # So SafeDict needs to be cast to dict for the method to work
-                return _real_str.maketrans(dict(args[0]))
-
-            if sum(approx_len_of(a) for a in args) > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This dict is too large")
-
-            return _real_str.maketrans(*args)
-
-        def replace(self, old, new, maxsplit=-1):
+        return super().expandtabs(tabsize)
+
+    def format(self, *args, **kwargs):
+        _raise_in_context(FeatureNotAvailable, "This method is not allowed")
+
+    def format_map(self, mapping):
+        _raise_in_context(FeatureNotAvailable, "This method is not allowed")
+
+    def join(self, seq):
+        full_seq = list(seq)  # consume the entire iterator so we can do length checking
+        i = JoinProxy(self.__class__, full_seq)  # proxy it so that .join gets the right types
+        # non-str items are skipped here, str.join will raise on them anyway
+        total_len = sum(len(item) for item in full_seq if isinstance(item, (_real_str, UserString)))
+        if (len(full_seq) - 1) * len(self) + total_len > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This str is too large")
+        return super().join(i)
+
+    def ljust(self, width, *args):
+        if width > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This str is too large")
+        return super().ljust(width, *args)
+
+    @classmethod
+    def maketrans(cls, *args):
+        if len(args) == 1 and isinstance(args[0], dict):
+            # str.maketrans expects a dict object and nothing else
+            # So SafeDict needs to be cast to dict for the method to work
+            return _real_str.maketrans(dict(args[0]))
+
+        if sum(approx_len_of(a) for a in args) > cls._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This dict is too large")
+
+        return _real_str.maketrans(*args)
+
+    def replace(self, old, new, maxsplit=-1):
+        growth = len(new) - len(old)
+        if growth > 0:  # the result can only be longer than this str if new is longer than old
+            max_len = self._config.max_const_len
             if maxsplit > 0:
                 n = maxsplit
             else:
-                n = self.count(old)
-            if n * (len(new) - len(old)) + len(self) > config.max_const_len:
+                # cheap upper bound on the number of occurrences; only count them if the bound is too loose
+                n = len(self) // len(old) if old else len(self) + 1
+                if n * growth + len(self) > max_len:
+                    n = self.count(old)
+            if n * growth + len(self) > max_len:
                 _raise_in_context(IterableTooLong, "This str is too large")
-            return super().replace(old, new, maxsplit)
+        return super().replace(old, new, maxsplit)
+
+    def rjust(self, width, *args):
+        if width > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This str is too large")
+        return super().rjust(width, *args)
+
+    def translate(self, table):
+        # this is kind of a disgusting way to check the worst-case length
+        # and is an overestimate by a multiplicative factor of len(table)
+        # but it is certainly an overestimate
+        if approx_len_of(table) * len(self) > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This str is too large")
+        table_proxy = TranslateTableProxy(self.__class__, table)
+        return super().translate(table_proxy)
+
+    def zfill(self, width):
+        if width > self._config.max_const_len:
+            _raise_in_context(IterableTooLong, "This str is too large")
+        return super().zfill(width)
+
+    def __format__(self, format_spec):
+        # format it using default str formatter
+        return self.data.__format__(format_spec)
+
+    def __mod__(self, values):
+        max_len = self._config.max_const_len
+        new_len_bound = len(self)
+        values_is_sequence = isinstance(values, collections.abc.Sequence)
+        values_is_mapping = isinstance(values, collections.abc.Mapping)
+
+        # validate that the template is safe (no massive widths/precisions)
+        i = 0
+        for match in PRINTF_TEMPLATE_RE.finditer(self.data):
+            w = match.group("width")
+            if w:
+                if w == "*":
+                    _raise_in_context(FeatureNotAvailable, "Star precision in printf-style formatting not allowed")
+                else:
+                    new_len_bound += int(w)
+
+            p = match.group("precision")
+            if p:
+                if p == "*":
+                    _raise_in_context(FeatureNotAvailable, "Star precision in printf-style formatting not allowed")
+                else:
+                    new_len_bound += int(p)
+
+            mapping_key = match.group("mapping_key")
+            if mapping_key is not None:  # '%(foo)s %(foo)s'
+                if not values_is_mapping:  # '%(foo)s' % 0
+                    raise TypeError("format requires a mapping")
+                val = values[mapping_key]
+                new_len_bound += approx_len_of(val)
+            elif values_is_sequence:  # '%s %s'
+                try:
+                    val = values[i]
+                except IndexError:  # '%s %s' % [0]
+                    raise TypeError("not enough arguments for format string")
+                new_len_bound += approx_len_of(val)
+            elif i > 0:  # '%s %s' % 0
+                raise TypeError("not enough arguments for format string")
+            else:  # '%s' % 0
+                new_len_bound += approx_len_of(values)
 
-        def rjust(self, width, *args):
-            if width > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This str is too large")
-            return super().rjust(width, *args)
+            if match.group("type") != "%":  # percent literals do not increase index
+                i += 1
 
-        def translate(self, table):
-            # this is kind of a disgusting way to check the worst-case length
-            # and is an overestimate by a multiplicative factor of len(table)
-            # but it is certainly an overestimate
-            if approx_len_of(table) * len(self) > config.max_const_len:
+            if new_len_bound > max_len:
                 _raise_in_context(IterableTooLong, "This str is too large")
-            table_proxy = TranslateTableProxy(self.__class__, table)
-            return super().translate(table_proxy)
 
-        def zfill(self, width):
-            if width > config.max_const_len:
-                _raise_in_context(IterableTooLong, "This str is too large")
-            return super().zfill(width)
-
-        def __format__(self, format_spec):
-            # format it using default str formatter
-            return self.data.__format__(format_spec)
-
-        def __mod__(self, values):
-            new_len_bound = len(self)
-            values_is_sequence = isinstance(values, collections.abc.Sequence)
-            values_is_mapping = isinstance(values, collections.abc.Mapping)
-
-            # validate that the template is safe (no massive widths/precisions)
-            i = 0
-            for match in PRINTF_TEMPLATE_RE.finditer(self.data):
-                w = match.group("width")
-                if w:
-                    if w == "*":
-                        _raise_in_context(FeatureNotAvailable, "Star precision in printf-style formatting not allowed")
-                    else:
-                        new_len_bound += int(w)
-
-                p = match.group("precision")
-                if p:
-                    if p == "*":
-                        _raise_in_context(FeatureNotAvailable, "Star precision in printf-style formatting not allowed")
-                    else:
-                        new_len_bound += int(p)
-
-                mapping_key = match.group("mapping_key")
-                if mapping_key is not None:  # '%(foo)s %(foo)s'
-                    if not values_is_mapping:  # '%(foo)s' % 0
-                        raise TypeError("format requires a mapping")
-                    val = values[mapping_key]
-                    new_len_bound += approx_len_of(val)
-                elif values_is_sequence:  # '%s %s'
-                    try:
-                        val = values[i]
-                    except IndexError:  # '%s %s' % [0]
-                        raise TypeError("not enough arguments for format string")
-                    new_len_bound += approx_len_of(val)
-                elif i > 0:  # '%s %s' % 0
-                    raise TypeError("not enough arguments for format string")
-                else:  # '%s' % 0
-                    new_len_bound += approx_len_of(values)
+        return _real_str.__mod__(self.data, values)
 
-                if match.group("type") != "%":  # percent literals do not increase index
-                    i += 1
 
-                if new_len_bound > config.max_const_len:
-                    _raise_in_context(IterableTooLong, "This str is too large")
+def safe_list(config):
+    return type("SafeList", (_SafeList,), {"__slots__": (), "_config": config})
+
 
-            return _real_str.__mod__(self.data, values)
+def safe_set(config):
+    return type("SafeSet", (_SafeSet,), {"__slots__": (), "_config": config})
 
-    return str
+
+def safe_dict(config):
+    return type("SafeDict", (_SafeDict,), {"__slots__": (), "_config": config})
+
+
+def safe_str(config):
+    # naming it SafeStr would break typeof backward compatibility :(
+    return type("str", (_SafeStr,), {"_config": config})
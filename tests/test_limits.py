@@ -72,6 +72,38 @@ def test_list(i, e):
     i.builtins["max"] = max
     e("max(*long, *long)")
 
+    # multiplying outside of the interpreter's operators should be checked too
+    i.builtins["mul"] = lambda a, b: a * b
+    e("half = [1] * 500")
+    assert e("mul(half, 2)") == [1] * 1000
+    assert e("mul(2, half)") == [1] * 1000
+    assert e("mul(half, -1)") == []
+    with utils.raises(IterableTooLong):
+        e("mul(half, 3)")
+    with utils.raises(IterableTooLong):
+        e("mul(3, half)")
+
+    class Three:
+        def __index__(self):
+            return 3
+
+    i.builtins["three"] = Three()
+    with utils.raises(IterableTooLong):
+        e("mul(half, three)")
+    with utils.raises(TypeError):
+        e("mul(half, 2.0)")
+
+    # the size of a list should not depend on how its items were added
+    i.builtins["big"] = "x" * 600
+    e("from_tuple = []")
+    e("from_tuple.extend((big,))")
+    with utils.raises(IterableTooLong):
+        e("from_tuple * 2")
+    e("from_gen = []")
+    e("from_gen.extend(x for x in (big,))")
+    with utils.raises(IterableTooLong):
+        e("from_gen * 2")
+
     # we should always be operating using safe lists
     i.builtins["reallist"] = [1, 2, 3]
     e("my_list = [1, 2, 3]")
@@ -189,6 +221,46 @@ def test_dict(i, e):
     # we should be able to unpack at the limit
     e("{**long}")
 
+    # values added by update() should count towards the size like those set by item assignment
+    i.builtins["big"] = "x" * 600
+    e("from_kwargs = {}")
+    e("from_kwargs.update(a=big)")
+    with utils.raises(IterableTooLong):
+        e("[from_kwargs] * 2")
+    e("from_pairs = {}")
+    e("from_pairs.update((('a', big),))")
+    with utils.raises(IterableTooLong):
+        e("[from_pairs] * 2")
+
+
+def test_dict_removal(i, e):
+    # removing an entry should free the size that was counted when it was set
+    e("d = {}")
+    e("big = [0] * 600")
+    e("d['a'] = big")
+    with utils.raises(IterableTooLong):
+        e("d['b'] = big")
+
+    e("d.pop('a')")
+    e("d['b'] = big")
+    assert e("d.pop('b')") == [0] * 600
+    e("d['c'] = big")
+    assert e("d.pop('c', None)") == [0] * 600
+    assert e("d.pop('c', None)") is None
+    e("d['d'] = big")
+    assert e("d.popitem()") == ("d", [0] * 600)
+    e("d['e'] = big")
+    e("d.clear()")
+
+    # overwriting a key should replace the size of its old value, not add to it
+    e("d['a'] = big")
+    e("d['a'] = big")
+    e("d.pop('a')")
+    assert i.names["d"].__approx_len__ == 0
+    e("d['a'] = big")
+    e("d['a'] = big[:500]")
+    e("d['b'] = big[:400]")
+
 
 def test_that_it_still_works_right(i, e):
     e("l = [1, 2]")
@@ -270,6 +342,27 @@ def test_types_again(i, e):
     assert e("typeof(a)") == "str"
 
 
+def test_nested_size(i, e):
+    # sizing deeply nested containers should not hit the python recursion limit
+    nested = []
+    for _ in range(5000):
+        nested = [nested]
+    i.builtins["nested"] = nested
+    with temp_limits(i, max_const_len=10000):
+        assert e("[nested]") == [nested]
+
+    # self-referential containers are only counted once
+    looped = [1, 2]
+    looped.append(looped)
+    i.builtins["looped"] = looped
+    e("[looped]")
+
+    # nor should we be able to bypass the limit by nesting
+    i.builtins["deep"] = [[[0] * 500], [[0] * 500]]
+    with utils.raises(IterableTooLong):
+        e("[deep]")
+
+
 def test_int_limits(e):
     max_int = (2**31) - 1
     min_int = -(2**31)
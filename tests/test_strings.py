@@ -53,6 +53,10 @@ def test_join(e):
         e("'foo'.join([1, 2, 3])")
     with utils.raises(IterableTooLong):
         e("(' ' * 999).join(' ' * 999)")
+    # n items only need n - 1 separators
+    assert e("(' ' * 499).join(['a', 'b'])") == (" " * 499).join(["a", "b"])
+    with utils.raises(IterableTooLong):
+        e("(' ' * 499).join(['a', 'b', 'c'])")
 
 
 def test_ljust(e):
@@ -70,6 +74,9 @@ def test_replace(e):
         e("'foo'.replace('o', 'a'*999)")
     with utils.raises(IterableTooLong):
         e("'foo'.replace('f', 'a'*999)")
+    assert e("'foo'.replace('', 'a'*249)") == "foo".replace("", "a" * 249)
+    with utils.raises(IterableTooLong):
+        e("'foo'.replace('', 'a'*250)")
 
 
 def test_rjust(e):
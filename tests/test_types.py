@@ -1,3 +1,6 @@
+import copy
+import weakref
+
 from draconic.versions import PY_39
 from . import utils
 
@@ -7,6 +10,7 @@ class TestList:
         e("a = [1, 2, 3]")
         e("b = list('123')")
         assert type(i.names["a"]) is type(i.names["b"]) is i._list
+        assert weakref.ref(i.names["a"])() is i.names["a"]
 
     def test_pop(self, e):
         e("a = [1, 2, 3]")
@@ -27,17 +31,51 @@ class TestList:
         with utils.raises(ValueError, match="not in list"):
             e("a.remove(1)")
 
+    def test_extend(self, e):
+        e("a = [1, 2, 3]")
+        e("a.extend([4, 5])")
+        assert e("a") == [1, 2, 3, 4, 5]
+
+        e("a.extend(x for x in (6, 7))")
+        assert e("a") == [1, 2, 3, 4, 5, 6, 7]
+
     def test_clear(self, e):
         e("a = [1, 2, 3]")
         e("a.clear()")
         assert e("a") == []
 
+    def test_copy(self, i, e):
+        e("a = [1, 2, 3]")
+        a = i.names["a"]
+        for b in (copy.copy(a), copy.deepcopy(a)):
+            assert type(b) is i._list
+            assert b == a
+            assert b.__approx_len__ == a.__approx_len__
+
+    def test_ops(self, i, e):
+        e("a = [1, 2, 3]")
+
+        assert e("a + [4]") == [1, 2, 3, 4]
+        assert type(e("a + [4]")) is i._list
+        assert e("a + (4,)") == [1, 2, 3, 4]
+
+        assert e("a * 2") == [1, 2, 3, 1, 2, 3]
+        assert type(e("a * 2")) is i._list
+        assert e("2 * a") == [1, 2, 3, 1, 2, 3]
+        assert e("a * -1") == []
+
+        assert e("a[1:]") == [2, 3]
+        assert type(e("a[1:]")) is i._list
+        assert e("a[0]") == 1
+
 
 class TestSet:
     def test_type(self, i, e):
         e("a = {1, 2, 3}")
         e("b = set('123')")
         assert type(i.names["a"]) is type(i.names["b"]) is i._set
+        assert weakref.ref(i.names["a"])() is i.names["a"]
+        assert not hasattr(i.names["a"], "__dict__")
 
     def test_intersection_update(self, e):
         e("a = {1, 2, 3}")
@@ -116,6 +154,8 @@ class TestDict:
         e("a = {1: 1, 2: 2}")
         e("b = dict(((1, 1), (2, 2)))")
         assert type(i.names["a"]) is type(i.names["b"]) is i._dict
+        assert weakref.ref(i.names["a"])() is i.names["a"]
+        assert not hasattr(i.names["a"], "__dict__")
 
     def test_update(self, e):
         e("a = {1: 1, 2: 2}")
@@ -126,6 +166,29 @@ class TestDict:
         e("a.update(a='foo')")
         assert e("a") == {1: 1, 2: 2, 3: 3, "a": "foo"}
 
+        e("a.update((k, k) for k in (4, 5))")
+        assert e("a") == {1: 1, 2: 2, 3: 3, "a": "foo", 4: 4, 5: 5}
+
+        # pairs only need to be iterable, even once some sizes are recorded
+        e("a[2] = [2]")
+        e("a.update([{7, 8}])")
+        assert e("a.get(7) == 8 or a.get(8) == 7")
+
+    def test_copy(self, i, e):
+        e("a = {1: 1}")
+        e("a[2] = [1, 2]")
+        a = i.names["a"]
+        a_len = a.__approx_len__
+        for b in (copy.copy(a), copy.deepcopy(a)):
+            assert type(b) is i._dict
+            assert b == a
+            assert b.__approx_len__ == a_len
+
+            # popping from the copy should not affect the original's size
+            b.pop(2)
+            assert b.__approx_len__ < a_len
+            assert a.__approx_len__ == a_len
+
     def test_access(self, i, e):
         e("a = {'a': 1, 'b': 2}")
         assert e("a.a") == e("a['a']")
@@ -12,8 +12,16 @@ from draconic.helpers import OperatorMixin
 def temp_limits(interpreter: OperatorMixin, **limits):
     old_config = interpreter._config
     interpreter._config = DraconicConfig(**limits)
+    # the safe types enforce the limits of the config they were created from, so swap them out too
+    old_types = {}
+    for attr in ("_str", "_list", "_set", "_dict"):
+        if hasattr(interpreter, attr):
+            old_types[attr] = getattr(interpreter, attr)
+            setattr(interpreter, attr, getattr(interpreter._config, attr))
     yield
     interpreter._config = old_config
+    for attr, old_type in old_types.items():
+        setattr(interpreter, attr, old_type)
 
 
 @contextlib.contextmanager